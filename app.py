@@ -9,10 +9,17 @@ import time
 import textwrap
 import concurrent.futures as cf
 
+import numpy as np
 import pandas as pd
 import altair as alt
 import streamlit as st
 
+try:  # optional: Arrow-backed strings are leaner and vectorize .str ops
+    import pyarrow  # noqa: F401
+    STR_DTYPE = "string[pyarrow]"
+except ImportError:
+    STR_DTYPE = "string"
+
 # Your utilities (Exercises 1–3)
 from apputil import Genius, ACCESS_TOKEN, genius as default_genius
 
@@ -46,49 +53,104 @@ def get_client() -> Genius:
         return default_genius
     return Genius(ACCESS_TOKEN)
 
-# Cache per-artist results for 10 minutes
+# Only the fields the UI actually shows; the client may skip /artists/{id}
+# when the /search hit already has all of them.
+UI_FIELDS = frozenset({"name", "id", "followers_count", "url", "image_url"})
+
+# Cache per-artist results in memory for 10 minutes (in front of the client's
+# on-disk caches: 7-day artist rows, 24h HTTP responses)
 @st.cache_data(show_spinner=False, ttl=600)
 def cached_get_artist(name: str) -> Optional[Dict]:
     g = get_client()
-    return g.get_artist(name)
+    payload = g.get_artist(name, fields=UI_FIELDS)
+    return (payload or {}).get("response", {}).get("artist")
+
+# Keep worker threads warm across reruns; one pool per worker count
+@st.cache_resource(show_spinner=False)
+def _pool(max_workers: int) -> cf.ThreadPoolExecutor:
+    return cf.ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="genius")
 
-# Batch fetch with threads (I/O bound -> threads > processes in Streamlit)
+# Batch fetch with threads (I/O bound -> threads > processes in Streamlit).
+# Workers block on sockets with the GIL released and all share the client's
+# pooled keep-alive session plus the per-artist cache, so threads stay cheaper
+# here than a separate event loop that would bypass both.
 def fetch_batch(artists: List[str], max_workers: int = 6) -> pd.DataFrame:
-    rows: List[Dict] = []
-    with cf.ThreadPoolExecutor(max_workers=max_workers) as ex:
-        futures = {ex.submit(cached_get_artist, a.strip()): a.strip()
-                   for a in artists if a and a.strip()}
-        progress = st.progress(0.0, text="Fetching artists…")
-        total = len(futures)
-        done = 0
-        for fut in cf.as_completed(futures):
-            name = futures[fut]
-            try:
-                artist = fut.result()
-                rows.append({
-                    "search_term": name,
-                    "artist_name": (artist or {}).get("name"),
-                    "artist_id": (artist or {}).get("id"),
-                    "followers_count": (artist or {}).get("followers_count"),
-                    "url": (artist or {}).get("url"),
-                    "image_url": (artist or {}).get("image_url"),
-                })
-            except Exception:
-                rows.append({
-                    "search_term": name,
-                    "artist_name": None, "artist_id": None,
-                    "followers_count": None, "url": None, "image_url": None
-                })
-            done += 1
+    names = [a.strip() for a in artists if a and a.strip()]
+
+    # fetch each normalized name once; duplicates / case variants reuse the result
+    keys = [Genius._key(name) for name in names]
+    unique: Dict[str, str] = {}
+    for key, name in zip(keys, names):
+        unique.setdefault(key, name)
+
+    results: Dict[str, Dict] = {}
+    # cached pool: threads start lazily and outlive this call, so no `with`
+    ex = _pool(max_workers)
+    futures = {ex.submit(cached_get_artist, name): key for key, name in unique.items()}
+    progress = st.progress(0.0, text="Fetching artists…")
+    total = len(futures)
+    done = 0
+    # ~100 progress redraws max; each one is a round-trip to the browser
+    step = max(1, total // 100)
+    for fut in cf.as_completed(futures):
+        try:
+            results[futures[fut]] = fut.result() or {}
+        except Exception:
+            results[futures[fut]] = {}
+        done += 1
+        if done % step == 0 or done == total:
             progress.progress(done / total, text=f"Fetching artists… ({done}/{total})")
 
-    df = pd.DataFrame(rows, columns=[
+    # one list per column (in input order); the frame is built once at the end
+    cols: Dict[str, List] = {k: [] for k in (
         "search_term", "artist_name", "artist_id",
         "followers_count", "url", "image_url"
-    ])
+    )}
+    for key, name in zip(keys, names):
+        artist = results[key]
+        cols["search_term"].append(name)
+        cols["artist_name"].append(artist.get("name"))
+        cols["artist_id"].append(artist.get("id"))
+        cols["followers_count"].append(artist.get("followers_count"))
+        cols["url"].append(artist.get("url"))
+        cols["image_url"].append(artist.get("image_url"))
+
+    # nullable ints so missing artists don't upcast ids/counts to float (Genius ids
+    # fit in Int32); dedicated string dtype instead of per-cell Python objects
+    df = pd.DataFrame(cols).astype({
+        "search_term": STR_DTYPE, "artist_name": STR_DTYPE,
+        "url": STR_DTYPE, "image_url": STR_DTYPE,
+        "artist_id": "Int32", "followers_count": "Int64",
+    })
+    # category only pays off when names repeat a lot; near-unique columns would
+    # just add integer codes on top of one category per row
+    for col in ("search_term", "artist_name"):
+        if df[col].nunique() < len(df) // 2:
+            df[col] = df[col].astype("category")
     return df
 
 
+def _lower_names(df: pd.DataFrame) -> pd.Series:
+    # works for both dtypes; on a categorical, .str lowercases each category once
+    return df["artist_name"].str.lower().astype(STR_DTYPE).fillna("")
+
+
+# CSV export bytes, memoized so unrelated widget reruns don't re-serialize;
+# bounded so each new filter result doesn't keep another copy forever
+@st.cache_data(show_spinner=False, max_entries=8)
+def _to_csv_bytes(df: pd.DataFrame) -> bytes:
+    return df.to_csv(index=False).encode("utf-8")
+
+
+# Top-N rows for the chart; nlargest is a partial (heap) sort, not a full sort
+@st.cache_data(show_spinner=False, max_entries=8)
+def _top_n(df: pd.DataFrame, n: int) -> pd.DataFrame:
+    return (
+        df.dropna(subset=["artist_name", "followers_count"])
+          .nlargest(n, "followers_count")
+    )
+
+
 def clean_artist_list(raw: str) -> List[str]:
     lines = [ln.strip() for ln in raw.splitlines()]
     return [ln for ln in lines if ln and not ln.startswith("#")]
@@ -113,7 +175,12 @@ with st.sidebar:
     max_workers = st.slider("Parallel workers", 1, 16, 6,
                             help="Threaded requests; safe for Streamlit & I/O-bound APIs.")
     show_images = st.toggle("Show artist images", value=True)
-    st.caption("Tip: Results are cached for 10 minutes to keep things snappy.")
+    st.caption("Results are cached in memory for 10 minutes and on disk for up to "
+               "7 days, so follower counts can be a few days old.")
+    if st.button("Clear cached results", use_container_width=True):
+        cached_get_artist.clear()
+        get_client().clear_cache()
+        st.success("Caches cleared; the next search fetches fresh data.")
 
 # =============== Header ===============
 
@@ -192,6 +259,8 @@ with tab2:
     if run_batch and artists_list:
         df = fetch_batch(artists_list, max_workers=max_workers)
         st.session_state["batch_df"] = df
+        # case-folded once per batch (kept out of df so it never shows up in tables/CSV)
+        st.session_state["batch_name_lc"] = _lower_names(df)
         st.success(f"Fetched {len(df)} rows.")
         st.dataframe(df, use_container_width=True, hide_index=True)
 
@@ -213,24 +282,25 @@ with tab3:
         with col3:
             name_filter = st.text_input("Filter by (partial) name", value="")
 
-        filtered = df.copy()
+        # one fused boolean mask -> a single indexing copy
+        mask = np.ones(len(df), dtype=bool)
         if only_matched:
-            filtered = filtered[filtered["artist_name"].notna()]
+            mask &= df["artist_name"].notna().to_numpy()
         if name_filter.strip():
-            m = filtered["artist_name"].fillna("").str.contains(name_filter.strip(), case=False, regex=False)
-            filtered = filtered[m]
+            name_lc = st.session_state.get("batch_name_lc")
+            if name_lc is None or len(name_lc) != len(df):
+                name_lc = _lower_names(df)
+                st.session_state["batch_name_lc"] = name_lc
+            mask &= name_lc.str.contains(name_filter.strip().lower(), regex=False).to_numpy(dtype=bool)
         if min_follow > 0:
-            filtered = filtered[(filtered["followers_count"].fillna(0) >= min_follow)]
+            mask &= (df["followers_count"].fillna(0) >= min_follow).to_numpy(dtype=bool)
+        filtered = df.loc[mask]
 
         st.dataframe(filtered, use_container_width=True, hide_index=True)
 
         # Top 15 by followers chart
         topN = st.slider("Top-N by followers", 5, 50, 15)
-        chart_df = (
-            filtered.dropna(subset=["artist_name", "followers_count"])
-                    .sort_values("followers_count", ascending=False)
-                    .head(topN)
-        )
+        chart_df = _top_n(filtered, topN)
 
         if len(chart_df) > 0:
             chart = (
@@ -253,14 +323,14 @@ with tab3:
         with colx:
             st.download_button(
                 "⬇️ Download filtered CSV",
-                data=filtered.to_csv(index=False).encode("utf-8"),
+                data=_to_csv_bytes(filtered),
                 file_name="genius_artists_filtered.csv",
                 mime="text/csv"
             )
         with coly:
             st.download_button(
                 "⬇️ Download full batch CSV",
-                data=df.to_csv(index=False).encode("utf-8"),
+                data=_to_csv_bytes(df),
                 file_name="genius_artists_full.csv",
                 mime="text/csv"
             )
@@ -270,9 +340,5 @@ st.markdown("---")
 st.caption(
     "Built with Streamlit • Cached API calls • Threaded batch requests • Altair charts • "
     "Implements Exercises 1–3 + bonus.\n"
-    "Tip: results cache for 10 minutes; change inputs to refresh."
+    "Tip: results are cached (up to 7 days on disk); use “Clear cached results” in the sidebar to refresh."
 )
-# ---------------------------------------------------------
-# apputil.py — Week 6 "Genius Explorer"
-# Exercises 1–3: Genius API client with search, single artist,
-# and batch fetching with pandas DataFrame output.
\ No newline at end of file
@@ -5,21 +5,104 @@
 # Genius class for Exercises 1–3 with smarter artist matching.
 # ---------------------------------------------------------
 
+import functools
+import json
 import os
 import re
+import threading
+import time
 import requests
+import numpy as np
 import pandas as pd
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 from pathlib import Path
 from dotenv import load_dotenv, find_dotenv
 
+try:  # optional: persist raw HTTP GETs on disk across restarts
+    from requests_cache import CachedSession
+except ImportError:  # pragma: no cover - falls back to a plain session
+    CachedSession = None
+
+try:  # optional: faster JSON parsing of API responses
+    from orjson import loads as _json_loads
+except ImportError:  # pragma: no cover - stdlib json accepts bytes too
+    _json_loads = json.loads
+
+try:  # optional: persist parsed artist payloads on disk between runs
+    import diskcache
+except ImportError:  # pragma: no cover - every lookup goes to the API
+    diskcache = None
+
 
 # ---------------------------------------------------------
-# Load environment variables (quietly)
+# Load environment variables (quietly, on first use)
 # ---------------------------------------------------------
-dotenv_path = find_dotenv(usecwd=True) or str(Path(__file__).resolve().parent / ".env")
-load_dotenv(dotenv_path=dotenv_path, override=True)
+@functools.lru_cache(maxsize=None)
+def _get_token() -> str | None:
+    """Read ACCESS_TOKEN from .env once; later calls reuse the result."""
+    dotenv_path = find_dotenv(usecwd=True) or str(Path(__file__).resolve().parent / ".env")
+    load_dotenv(dotenv_path=dotenv_path, override=True)
+    return os.getenv("ACCESS_TOKEN")
+
+
+@functools.lru_cache(maxsize=None)
+def _row_cache():
+    """Open the on-disk artist cache on first use (None without diskcache)."""
+    if diskcache is None:
+        return None
+    return diskcache.Cache(".genius_rows", size_limit=int(2e8))
 
-ACCESS_TOKEN = os.getenv("ACCESS_TOKEN")
+_NORM_RE = re.compile(r"[^a-z0-9]+")
+
+
+# ---------------------------------------------------------
+# Rate limiting: one token bucket shared by every client/thread
+# ---------------------------------------------------------
+class _TokenBucket:
+    """Allow bursts up to `capacity`, refilling at `rate` tokens per second."""
+
+    def __init__(self, rate: float, capacity: float):
+        self.rate = rate
+        self.capacity = capacity
+        self.tokens = capacity
+        self.ts = time.monotonic()
+        self.lock = threading.Lock()
+
+    def acquire(self):
+        """Take one token, sleeping (outside the lock) only when the bucket is empty."""
+        with self.lock:
+            now = time.monotonic()
+            self.tokens = min(self.capacity, self.tokens + (now - self.ts) * self.rate)
+            self.ts = now
+            # going negative reserves the token, so concurrent waiters queue up
+            wait = max(0.0, (1 - self.tokens) / self.rate)
+            self.tokens -= 1
+        if wait:
+            time.sleep(wait)
+
+
+_BUCKET = _TokenBucket(rate=20, capacity=40)
+
+
+class _RateLimitedAdapter(HTTPAdapter):
+    """HTTPAdapter that takes a token per request actually sent on the wire.
+
+    A CachedSession answers hits before reaching the adapter, so those stay free.
+    """
+
+    def send(self, request, **kwargs):
+        _BUCKET.acquire()
+        return super().send(request, **kwargs)
+
+
+class _RateLimitedRetry(Retry):
+    """Retry that also takes a token before each re-attempt urllib3 makes."""
+
+    def increment(self, *args, **kwargs):
+        new_retry = super().increment(*args, **kwargs)  # raises when exhausted
+        _BUCKET.acquire()
+        return new_retry
 
 
 # ---------------------------------------------------------
@@ -37,6 +120,29 @@ class Genius:
         self.base_url = "https://api.genius.com"
         self._headers = {"Authorization": f"Bearer {self.access_token}"} if self.access_token else {}
 
+        # One pooled keep-alive session per client: search -> artist calls
+        # (and threads sharing this instance) reuse the same TLS connections.
+        # With requests-cache installed, GETs are also memoized in SQLite
+        # (keyed by URL + params) so warm reruns skip the network entirely.
+        if CachedSession is not None:
+            self._session = CachedSession(
+                ".genius_cache",
+                backend="sqlite",
+                expire_after=86400,
+                allowable_methods=("GET",),
+                stale_if_error=True,
+            )
+        else:
+            self._session = requests.Session()
+        self._session.headers.update(self._headers)
+        retry = _RateLimitedRetry(
+            total=5,
+            backoff_factor=0.3,
+            status_forcelist=[429, 500, 502, 503, 504],
+            allowed_methods=["GET"],
+        )
+        self._session.mount("https://", _RateLimitedAdapter(pool_maxsize=32, max_retries=retry))
+
     def __repr__(self):
         prefix = (self.access_token[:6] + "...") if self.access_token else "EMPTY"
         return f"Genius(access_token='{prefix}')"
@@ -45,7 +151,13 @@ class Genius:
     @staticmethod
     def _norm(s: str) -> str:
         """Normalize names for fuzzy comparison."""
-        return re.sub(r"[^a-z0-9]+", " ", s.lower()).strip()
+        return _NORM_RE.sub(" ", s.lower()).strip()
+
+    @staticmethod
+    def _key(s: str) -> str:
+        """Dedup/cache key: the normalized name, or the lowercased raw name when
+        normalizing leaves nothing (non-Latin scripts, punctuation-only names)."""
+        return Genius._norm(s) or s.strip().lower()
 
     def _pick_best_artist(self, search_term: str, hits: list):
         """Choose the most plausible primary_artist from /search hits."""
@@ -53,61 +165,88 @@ class Genius:
             return None
 
         q = self._norm(search_term)
+        names = [h["result"]["primary_artist"]["name"] for h in hits]
+        norms = [self._norm(n) for n in names]
 
-        def score(hit):
-            name = hit["result"]["primary_artist"]["name"]
-            n = self._norm(name)
-            # exact match best, then prefix/word match, then substring; prefer shorter names on ties
-            if n == q:
-                return (3, -len(name))
-            if n.startswith(q) or q in n.split():
-                return (2, -len(name))
-            if q in n:
-                return (1, -len(name))
-            return (0, -len(name))
-
-        best = max(hits, key=score)
-        return best["result"]["primary_artist"]
+        # exact match best, then prefix/word match, then substring; prefer shorter names on ties
+        tiers = np.where(
+            np.array(norms) == q, 3,
+            np.where([n.startswith(q) or q in n.split() for n in norms], 2,
+                     np.where([q in n for n in norms], 1, 0)),
+        )
+        lens = -np.fromiter(map(len, names), dtype=np.int32, count=len(names))
+
+        # lexsort sorts by the last key first; like max(), ties go to the earliest hit
+        idx = np.lexsort((-np.arange(len(hits)), lens, tiers))[-1]
+        return hits[idx]["result"]["primary_artist"]
 
     # ---------- Exercise 2 ----------
-    def get_artist(self, search_term: str):
+    def get_artist(self, search_term: str, fields: frozenset | None = None):
         """
         Search Genius for an artist and return the FULL /artists/{id} JSON payload.
         (This matches typical autograder expectations that a 'response' key exists.)
+        Only when the caller passes an explicit `fields` set that the /search hit
+        already covers is that hit returned instead, in the same
+        {"response": {"artist": ...}} shape, skipping the second request.
         Returns None if not found or on recoverable API issues.
+        Found payloads are kept for a week in an on-disk cache (if diskcache
+        is installed), keyed by Genius._key(search_term) and `fields`.
         """
+        key = (self._key(search_term), tuple(sorted(fields)) if fields is not None else None)
+        cache = _row_cache()
+        if cache is not None:
+            cached = cache.get(key)
+            if cached is not None:
+                return cached
+
+        payload = self._fetch_artist(search_term, fields)
+        if payload is not None and cache is not None:
+            cache.set(key, payload, expire=7 * 86400)
+        return payload
+
+    def _fetch_artist(self, search_term: str, fields: frozenset | None):
+        """Uncached /search (+ /artists/{id}) round-trip behind get_artist."""
         try:
             # 1) search
             params = {"q": search_term}
-            r = requests.get(
+            r = self._session.get(
                 f"{self.base_url}/search",
-                headers=self._headers,
                 params=params,
                 timeout=15,
             )
             r.raise_for_status()
-            hits = r.json().get("response", {}).get("hits", [])
+            hits = _json_loads(r.content).get("response", {}).get("hits", [])
 
             primary = self._pick_best_artist(search_term, hits)
             if not primary:
                 return None
 
+            if fields is not None and fields.issubset(primary.keys()):
+                return {"response": {"artist": primary}}
+
             artist_id = primary.get("id")
             if artist_id is None:
                 return None
 
             # 2) fetch full artist payload and RETURN IT (contains top-level "response")
-            r2 = requests.get(
+            r2 = self._session.get(
                 f"{self.base_url}/artists/{artist_id}",
-                headers=self._headers,
                 timeout=15,
             )
             r2.raise_for_status()
-            return r2.json()
+            return _json_loads(r2.content)
 
         except Exception:
             return None
 
+    def clear_cache(self):
+        """Drop the on-disk artist rows and cached HTTP responses."""
+        cache = _row_cache()
+        if cache is not None:
+            cache.clear()
+        if hasattr(self._session, "cache"):  # requests-cache CachedSession
+            self._session.cache.clear()
+
     # ---------- Exercise 3 ----------
     def get_artists(self, search_terms):
         """
@@ -146,10 +285,21 @@ class Genius:
 
 
 # ---------------------------------------------------------
-# Optional: instantiate default Genius object from .env
-# (No side effects / prints at import time)
+# Optional: default Genius object from .env
+# (Built lazily: importing this module does no I/O)
 # ---------------------------------------------------------
-genius = Genius(ACCESS_TOKEN) if ACCESS_TOKEN is not None else Genius("")
+@functools.lru_cache(maxsize=None)
+def _get_default_genius() -> Genius:
+    return Genius(_get_token())
+
+
+def __getattr__(name: str):
+    # `from apputil import ACCESS_TOKEN, genius` keeps working, resolved on first access
+    if name == "ACCESS_TOKEN":
+        return _get_token()
+    if name == "genius":
+        return _get_default_genius()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
 
 # ---------------------------------------------------------
@@ -157,8 +307,8 @@ genius = Genius(ACCESS_TOKEN) if ACCESS_TOKEN is not None else Genius("")
 # ---------------------------------------------------------
 if __name__ == "__main__":
     # Example (will only run if you execute `python apputil.py`)
+    genius = _get_default_genius()
     info = genius.get_artist("Radiohead")
     print(info)
     df = genius.get_artists(["Rihanna", "Tycho", "Seal", "U2"])
     print(df)
-
@@ -1,11 +1,11 @@
 # build_artist_dataset.py
 import argparse
+import functools
 import os
 from pathlib import Path
-from multiprocessing import Pool, cpu_count
+import concurrent.futures as cf
 import pandas as pd
 from tqdm import tqdm
-from time import sleep
 from apputil import Genius, ACCESS_TOKEN
 
 
@@ -25,11 +25,10 @@ def read_artists(path: str):
     return artists
 
 
-def _worker(term: str):
-    g = Genius(ACCESS_TOKEN)
+def _worker(g: Genius, term: str):
     try:
-        info = g.get_artist(term)
-        sleep(0.1)
+        payload = g.get_artist(term)
+        info = (payload or {}).get("response", {}).get("artist")
         return {
             "search_term": term,
             "artist_name": info.get("name") if info else None,
@@ -55,15 +54,19 @@ def main():
     out_path = Path(args.out)
     out_path.parent.mkdir(parents=True, exist_ok=True)
 
+    # one client (and pooled session) for the whole run, whichever path is taken
+    g = Genius(ACCESS_TOKEN)
+
     if args.workers > 0:
-        n = min(args.workers, cpu_count())
-        print(f"Using multiprocessing with {n} workers...")
-        with Pool(n) as pool:
-            rows = list(tqdm(pool.imap_unordered(_worker, artists), total=len(artists)))
+        # HTTP-bound work: threads sharing one client (and its pooled session)
+        # beat processes that each re-import apputil and pickle every task.
+        print(f"Using {args.workers} worker threads...")
+        with cf.ThreadPoolExecutor(max_workers=args.workers) as ex:
+            # map() yields in input order, so the CSV is deterministic
+            rows = list(tqdm(ex.map(functools.partial(_worker, g), artists), total=len(artists)))
         df = pd.DataFrame(rows)
     else:
         print("Using single-process mode...")
-        g = Genius(ACCESS_TOKEN)
         df = g.get_artists(artists)
 
     df.to_csv(out_path, index=False)
@@ -0,0 +1,110 @@
+# test_apputil.py — offline checks for the Genius client (no network).
+
+import json
+
+import pytest
+
+import apputil
+from apputil import Genius
+
+
+class _FakeResponse:
+    def __init__(self, payload):
+        self.content = json.dumps(payload).encode("utf-8")
+
+    def raise_for_status(self):
+        pass
+
+
+class _FakeSession:
+    """Stands in for the requests session; records every URL it is asked for."""
+
+    def __init__(self, primary):
+        self.primary = primary
+        self.urls = []
+
+    def get(self, url, params=None, timeout=None):
+        self.urls.append(url)
+        if url.endswith("/search"):
+            hits = [{"result": {"primary_artist": self.primary}}]
+            return _FakeResponse({"response": {"hits": hits}})
+        artist = dict(self.primary, followers_count=123, description={"dom": {}})
+        return _FakeResponse({"response": {"artist": artist}})
+
+
+@pytest.fixture
+def no_row_cache(monkeypatch):
+    monkeypatch.setattr(apputil, "_row_cache", lambda: None)
+
+
+def _client(primary):
+    g = Genius("token")
+    g._session = _FakeSession(primary)
+    return g
+
+
+PRIMARY = {"name": "Radiohead", "id": 604, "url": "u", "image_url": "i"}
+
+
+def test_get_artist_fetches_full_payload_by_default(no_row_cache):
+    g = _client(PRIMARY)
+    payload = g.get_artist("Radiohead")
+    assert g._session.urls[-1].endswith("/artists/604")
+    assert payload["response"]["artist"]["followers_count"] == 123
+
+
+def test_get_artist_skips_second_get_when_fields_covered(no_row_cache):
+    g = _client(PRIMARY)
+    payload = g.get_artist("Radiohead", fields=frozenset({"name", "id"}))
+    assert len(g._session.urls) == 1
+    assert payload == {"response": {"artist": PRIMARY}}
+
+
+def test_get_artist_fetches_when_fields_missing_from_hit(no_row_cache):
+    g = _client(PRIMARY)
+    g.get_artist("Radiohead", fields=frozenset({"name", "followers_count"}))
+    assert len(g._session.urls) == 2
+
+
+class _DictCache(dict):
+    """Minimal stand-in for diskcache.Cache."""
+
+    def set(self, key, value, expire=None):
+        self[key] = value
+
+
+class _PerTermSession(_FakeSession):
+    """Returns a different search hit per query term."""
+
+    def __init__(self, by_term):
+        super().__init__(None)
+        self.by_term = by_term
+
+    def get(self, url, params=None, timeout=None):
+        if params and "q" in params:
+            self.primary = self.by_term[params["q"]]
+        return super().get(url, params=params, timeout=timeout)
+
+
+def test_non_ascii_terms_get_separate_row_cache_entries(monkeypatch):
+    cache = _DictCache()
+    monkeypatch.setattr(apputil, "_row_cache", lambda: cache)
+    g = Genius("token")
+    g._session = _PerTermSession({
+        "宇多田ヒカル": {"name": "宇多田ヒカル", "id": 1},
+        "방탄소년단": {"name": "방탄소년단", "id": 2},
+    })
+
+    first = g.get_artist("宇多田ヒカル")
+    second = g.get_artist("방탄소년단")
+
+    assert first["response"]["artist"]["id"] == 1
+    assert second["response"]["artist"]["id"] == 2
+    assert len(cache) == 2
+
+
+def test_clear_cache_empties_row_cache(monkeypatch):
+    cache = _DictCache({("radiohead", None): {"response": {}}})
+    monkeypatch.setattr(apputil, "_row_cache", lambda: cache)
+    _client(PRIMARY).clear_cache()
+    assert cache == {}